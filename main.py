@@ -1,7 +1,17 @@
 import sqlite3
 import os
+import asyncio
+import json
+import re
 import argparse
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import date
+from pathlib import Path
+from typing import NotRequired, TypedDict
 from mcp.server.fastmcp import FastMCP
 
 # Parse command line arguments
@@ -13,11 +23,188 @@ mcp = FastMCP("macro-tracker")
 # Database path from command line argument
 DB_PATH = os.path.expanduser("~/macro_tracker.db")
 
+class Macros(TypedDict):
+    """Calories plus protein, carbs and fat in grams."""
+    calories: float
+    protein: float
+    carbs: float
+    fat: float
+
+def _macro_values(macros):
+    """Return the values of a Macros dict in the column order used by every table."""
+    return macros['calories'], macros['protein'], macros['carbs'], macros['fat']
+
+class IntakeEntry(TypedDict):
+    """One food entry for log_food_intake_bulk; fields mean the same as in log_food_intake."""
+    food_name: str
+    macros: Macros
+    portion_description: str
+    meal_type: NotRequired[str]
+    date_str: NotRequired[str]
+
+# Bumped whenever _create_tables() changes; stored in PRAGMA user_version
+SCHEMA_VERSION = 5
+
+# Hot SQL statements, kept as constants so sqlite3's statement cache reuses
+# their prepared form on every call
+SQL_UPSERT_GOALS = '''
+    INSERT OR REPLACE INTO daily_goals 
+    (date, target_calories, target_protein, target_carbs, target_fat)
+    VALUES (?, ?, ?, ?, ?)
+'''
+SQL_INSERT_FOOD = '''
+    INSERT INTO foods (name, calories, protein, carbs, fat)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(name) DO NOTHING
+    RETURNING id
+'''
+SQL_SEARCH_FOODS = r"SELECT name, calories, protein, carbs, fat FROM foods WHERE name LIKE ? ESCAPE '\'"
+SQL_SEARCH_FOODS_FTS = '''
+    SELECT f.name, f.calories, f.protein, f.carbs, f.fat FROM foods f
+    JOIN foods_fts ON foods_fts.rowid = f.id
+    WHERE foods_fts MATCH ?
+'''
+SQL_SELECT_FOODS = 'SELECT name, calories, protein, carbs, fat FROM foods ORDER BY name'
+SQL_INSERT_INTAKE = '''
+    INSERT INTO daily_intake 
+    (date, food_name, portion_description, calories, protein, carbs, fat, meal_type)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+SQL_DATABASE_STATS = '''
+    SELECT (SELECT COUNT(*) FROM foods),
+           (SELECT COUNT(*) FROM daily_intake),
+           (SELECT COUNT(DISTINCT date) FROM daily_goals)
+'''
+SQL_DAY_TOTALS = '''
+    SELECT COUNT(*), COALESCE(SUM(calories), 0), COALESCE(SUM(protein), 0),
+           COALESCE(SUM(carbs), 0), COALESCE(SUM(fat), 0)
+    FROM daily_intake
+    WHERE date = ?
+'''
+SQL_SELECT_GOALS = '''
+    SELECT target_calories, target_protein, target_carbs, target_fat
+    FROM daily_goals
+    WHERE date = ?
+'''
+# One row per meal type, meals in the order they were first logged, with the meal's
+# entries as a JSON array of [food_name, portion, calories, protein, carbs, fat].
+# The ordered subquery (served by the (date, meal_type, created_at) index) feeds
+# each group its entries in logging order.
+SQL_SELECT_MEALS = '''
+    SELECT meal_type,
+           json_group_array(json_array(food_name, portion_description,
+                                       calories, protein, carbs, fat))
+    FROM (
+        SELECT id, meal_type, food_name, portion_description, calories, protein, carbs, fat
+        FROM daily_intake
+        WHERE date = ?
+        ORDER BY meal_type, created_at, id
+    )
+    GROUP BY meal_type
+    ORDER BY MIN(id)
+'''
+
+# Per-row output templates for lookup_food and review_meals, bound once
+_FMT_FOOD = "• {}: {}cal, {}g protein, {}g carbs, {}g fat".format
+_FMT_MEAL_ITEM = "• {} {}".format
+_FMT_MEAL_MACROS = "  {:.0f} cal | {:.1f}g protein | {:.1f}g carbs | {:.1f}g fat\n".format
+_FMT_DAY_TOTALS = "• Total: {:.0f} cal | {:.1f}g protein | {:.1f}g carbs | {:.1f}g fat".format
+# (label, unit, number format) for each review_day progress line, in column order
+_DAY_MACRO_LINES = (("Calories", " cal", ".0f"), ("Protein", "g", ".1f"),
+                    ("Carbs", "g", ".1f"), ("Fat", "g", ".1f"))
+
+# Single read-write connection opened by init_database(), used only under _WRITE_LOCK
+_WRITER = None
+# Read-only connections handed out by _reader(); WAL lets them run alongside the writer
+_READER_COUNT = 4
+_READERS = queue.SimpleQueue()
+# Serializes all use of _WRITER
+_WRITE_LOCK = threading.Lock()
+# Dedicated threads for blocking SQLite calls, kept apart from the default executor
+_DB_EXECUTOR = ThreadPoolExecutor(max_workers=_READER_COUNT + 1, thread_name_prefix='macro-db')
+
+@contextmanager
+def _write_transaction(conn=None):
+    """Hold the write lock and run the enclosed statements in one transaction.
+    
+    Uses the published writer unless init_database() passes the one it is still setting up.
+    """
+    with _WRITE_LOCK:
+        conn = conn or _WRITER
+        cursor = conn.cursor()
+        cursor.execute('BEGIN')
+        try:
+            yield cursor
+            cursor.execute('COMMIT')
+        except BaseException:
+            # SQLite may already have rolled back on its own (e.g. after an I/O error)
+            if conn.in_transaction:
+                cursor.execute('ROLLBACK')
+            raise
+
+@contextmanager
+def _reader():
+    """Check out a read-only connection and yield a cursor on it."""
+    conn = _READERS.get()
+    try:
+        yield conn.cursor()
+    finally:
+        _READERS.put(conn)
+
+def _configure(conn):
+    """Apply the per-connection settings shared by the writer and the readers."""
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-64000')
+    # Map up to 256MB of the file so reads skip read() syscalls; SQLite maps only what exists
+    conn.execute('PRAGMA mmap_size=268435456')
+    # Tools unpack rows positionally, so keep plain tuples and str text on the hot
+    # paths; opt into sqlite3.Row per cursor if a tool ever needs named access
+    assert conn.row_factory is None
+    conn.text_factory = str
+
 def init_database():
-    """Initialize the SQLite database with required tables."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    """Open the writer and reader connections and create the required tables.
     
+    Nothing is published to _WRITER/_READERS until every connection is open, so a
+    failure closes whatever was opened and leaves the next call free to retry.
+    """
+    global _WRITER
+    opened = []
+    try:
+        writer = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None,
+                                 cached_statements=256)
+        opened.append(writer)
+        # page_size only applies to a brand-new file, so it must precede WAL and any table
+        writer.execute('PRAGMA page_size=4096')
+        writer.execute('PRAGMA journal_mode=WAL')
+        writer.execute('PRAGMA synchronous=NORMAL')
+        _configure(writer)
+        
+        # Skip the DDL entirely when the schema is already current
+        if writer.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+            with _write_transaction(writer) as cursor:
+                _create_tables(cursor)
+                cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        
+        # Readers are opened after the schema exists so they never see a half-built file.
+        # as_uri() percent-encodes the path, so '#', '?' and '%' in it stay part of the name.
+        reader_uri = Path(DB_PATH).resolve().as_uri() + '?mode=ro'
+        for _ in range(_READER_COUNT):
+            conn = sqlite3.connect(reader_uri, uri=True, check_same_thread=False,
+                                   isolation_level=None, cached_statements=256)
+            opened.append(conn)
+            _configure(conn)
+    except BaseException:
+        for conn in opened:
+            conn.close()
+        raise
+    
+    for conn in opened[1:]:
+        _READERS.put(conn)
+    _WRITER = writer
+
+def _create_tables(cursor):
+    """Create the schema and migrate old layouts."""
     # Create foods table for food database
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS foods (
@@ -60,6 +247,12 @@ def init_database():
         )
     ''')
     
+    # Lets review_meals read a day's entries in order without a sort
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_intake_date_meal_time
+        ON daily_intake(date, meal_type, created_at)
+    ''')
+    
     # Migrate old schema if needed
     cursor.execute("PRAGMA table_info(daily_intake)")
     columns = [column[1] for column in cursor.fetchall()]
@@ -70,159 +263,250 @@ def init_database():
         # Update existing records
         cursor.execute('UPDATE daily_intake SET portion_description = serving_size_g || "g" WHERE portion_description = "unknown portion"')
     
-    conn.commit()
-    conn.close()
+    # Trigram index over food names, kept in sync with foods by triggers, so
+    # lookup_food can match anywhere inside a name. Dropped first so databases
+    # built with the old word tokenizer are reindexed.
+    cursor.execute('DROP TABLE IF EXISTS foods_fts')
+    cursor.execute('''
+        CREATE VIRTUAL TABLE foods_fts
+        USING fts5(name, content='foods', content_rowid='id', tokenize='trigram')
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS foods_fts_insert AFTER INSERT ON foods BEGIN
+            INSERT INTO foods_fts(rowid, name) VALUES (new.id, new.name);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS foods_fts_delete AFTER DELETE ON foods BEGIN
+            INSERT INTO foods_fts(foods_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS foods_fts_update AFTER UPDATE OF name ON foods BEGIN
+            INSERT INTO foods_fts(foods_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            INSERT INTO foods_fts(rowid, name) VALUES (new.id, new.name);
+        END
+    ''')
+    # Index foods added before the FTS table was (re)created
+    cursor.execute("INSERT INTO foods_fts(foods_fts) VALUES ('rebuild')")
+
+def _fts_query(text):
+    """Build a trigram substring query on food names, or None if the text is shorter than a trigram."""
+    if len(text) < 3:
+        return None
+    return '"' + text.replace('"', '""') + '"'
+
+# (epoch second, ISO date) of the last _today() call
+_today_cache = (0, '')
+
+def _today():
+    """Return today's date as YYYY-MM-DD, reformatted at most once per second."""
+    global _today_cache
+    now = int(time.time())
+    if _today_cache[0] != now:
+        _today_cache = (now, date.today().isoformat())
+    return _today_cache[1]
 
-# Initialize database on startup
-init_database()
+# Guards the one-time init_database() call made by _ensured_db()
+_INIT_LOCK = threading.Lock()
+
+def _ensured_db():
+    """Open the database on first use so importing this module has no side effects."""
+    if _WRITER is None:
+        with _INIT_LOCK:
+            if _WRITER is None:
+                init_database()
+
+def _call_db(func, *args):
+    """Make sure the database is open, then run a blocking database helper."""
+    try:
+        _ensured_db()
+    except Exception as e:
+        return f"❌ Error opening database: {str(e)}"
+    return func(*args)
+
+async def _run_db(func, *args):
+    """Run a blocking database helper on the DB executor and await its result."""
+    return await asyncio.get_running_loop().run_in_executor(_DB_EXECUTOR, _call_db, func, *args)
 
 # ===== TOOLS =====
+# Each tool's blocking SQLite work lives in a _sync_* helper that the async
+# tool runs via _run_db, keeping the event loop free during I/O.
 
-@mcp.tool()
-async def set_daily_goals(target_calories: float, target_protein: float, 
-                         target_carbs: float, target_fat: float, date_str: str = None) -> str:
-    """Set daily macro goals.
-    
-    Args:
-        target_calories: Target calories for the day
-        target_protein: Target protein in grams
-        target_carbs: Target carbohydrates in grams
-        target_fat: Target fat in grams
-        date_str: Date in YYYY-MM-DD format (optional, defaults to today)
-    """
+def _sync_set_daily_goals(targets: Macros, date_str: str = None) -> str:
+    """Blocking body of set_daily_goals, run in a worker thread."""
     try:
         if date_str is None:
-            date_str = date.today().isoformat()
-        
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO daily_goals 
-            (date, target_calories, target_protein, target_carbs, target_fat)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (date_str, target_calories, target_protein, target_carbs, target_fat))
+            date_str = _today()
         
-        conn.commit()
-        conn.close()
+        with _write_transaction() as cursor:
+            cursor.execute(SQL_UPSERT_GOALS, (date_str, *_macro_values(targets)))
         
         return f"✅ Set daily goals for {date_str}:\n" \
-               f"🎯 {target_calories} calories, {target_protein}g protein, " \
-               f"{target_carbs}g carbs, {target_fat}g fat"
+               f"🎯 {targets['calories']} calories, {targets['protein']}g protein, " \
+               f"{targets['carbs']}g carbs, {targets['fat']}g fat"
     except Exception as e:
         return f"❌ Error setting goals: {str(e)}"
 
 @mcp.tool()
-async def add_food_to_database(name: str, calories: float, protein: float, 
-                              carbs: float, fat: float) -> str:
-    """Add a new food to the reference database for future lookups.
+async def set_daily_goals(targets: Macros, date_str: str = None) -> str:
+    """Set daily macro goals.
     
     Args:
-        name: Name of the food
-        calories: Calories per 100g (for reference)
-        protein: Protein in grams per 100g (for reference)
-        carbs: Carbohydrates in grams per 100g (for reference)
-        fat: Fat in grams per 100g (for reference)
+        targets: Target calories for the day, plus target protein, carbs and fat in grams
+        date_str: Date in YYYY-MM-DD format (optional, defaults to today)
     """
+    return await _run_db(_sync_set_daily_goals, targets, date_str)
+
+def _sync_add_food_to_database(name: str, macros: Macros) -> str:
+    """Blocking body of add_food_to_database, run in a worker thread."""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO foods (name, calories, protein, carbs, fat)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (name, calories, protein, carbs, fat))
+        with _write_transaction() as cursor:
+            cursor.execute(SQL_INSERT_FOOD, (name, *_macro_values(macros)))
+            inserted = cursor.fetchone()
         
-        conn.commit()
-        conn.close()
+        # No id returned means the name was already taken
+        if inserted is None:
+            return f"❌ Food '{name}' already exists in database"
         
+        calories, protein, carbs, fat = _macro_values(macros)
         return f"✅ Added {name} to food database\n" \
                f"Reference values per 100g: {calories} cal, {protein}g protein, {carbs}g carbs, {fat}g fat"
-    except sqlite3.IntegrityError:
-        return f"❌ Food '{name}' already exists in database"
     except Exception as e:
         return f"❌ Error adding food: {str(e)}"
 
 @mcp.tool()
-async def lookup_food(name: str = None) -> str:
-    """Look up foods in the database for macro reference.
+async def add_food_to_database(name: str, macros: Macros) -> str:
+    """Add a new food to the reference database for future lookups.
     
     Args:
-        name: Specific food name to look up (optional, if not provided returns all foods)
+        name: Name of the food
+        macros: Calories, plus protein, carbs and fat in grams, per 100g (for reference)
     """
+    return await _run_db(_sync_add_food_to_database, name, macros)
+
+def _sync_lookup_food(name: str = None) -> str:
+    """Blocking body of lookup_food, run in a worker thread."""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        if name:
-            cursor.execute('SELECT * FROM foods WHERE name LIKE ?', (f'%{name}%',))
-            foods = cursor.fetchall()
-            
-            if not foods:
-                conn.close()
-                return f"❌ No foods found matching '{name}'"
-        else:
-            cursor.execute('SELECT * FROM foods ORDER BY name')
-            foods = cursor.fetchall()
+        with _reader() as cursor:
+            if name:
+                match = _fts_query(name)
+                if match:
+                    cursor.execute(SQL_SEARCH_FOODS_FTS, (match,))
+                else:
+                    # Too short for a trigram, so scan with an escaped LIKE
+                    pattern = re.sub(r'([\\%_])', r'\\\1', name)
+                    cursor.execute(SQL_SEARCH_FOODS, (f'%{pattern}%',))
+                foods = cursor.fetchall()
+            else:
+                cursor.execute(SQL_SELECT_FOODS)
+                foods = cursor.fetchall()
         
-        conn.close()
+        if name and not foods:
+            return f"❌ No foods found matching '{name}'"
         
         if not foods:
             return "📝 No foods in database yet. Use add_food_to_database to add some."
         
-        result = "🍎 Food Database (per 100g)\n"
-        result += "=" * 30 + "\n"
+        parts = ["🍎 Food Database (per 100g)", "=" * 30]
         
         for food in foods:
-            _, name, calories, protein, carbs, fat, _ = food
-            result += f"• {name}: {calories}cal, {protein}g protein, {carbs}g carbs, {fat}g fat\n"
+            parts.append(_FMT_FOOD(*food))
         
-        return result
+        return "\n".join(parts) + "\n"
     except Exception as e:
         return f"❌ Error looking up foods: {str(e)}"
 
 @mcp.tool()
-async def log_food_intake(food_name: str, calories: float, protein: float, 
-                         carbs: float, fat: float, portion_description: str,
-                         meal_type: str = "other", date_str: str = None) -> str:
+async def lookup_food(name: str = None) -> str:
+    """Look up foods in the database for macro reference.
+    
+    Args:
+        name: Specific food name to look up (optional, if not provided returns all foods)
+    """
+    return await _run_db(_sync_lookup_food, name)
+
+def _insert_intake_rows(rows):
+    """Insert daily_intake rows with one prepared statement in a single transaction.
+    
+    Each row is (date, food_name, portion_description, calories, protein, carbs, fat, meal_type).
+    """
+    with _write_transaction() as cursor:
+        cursor.executemany(SQL_INSERT_INTAKE, rows)
+
+def _sync_log_food_intake(food_name: str, macros: Macros, portion_description: str,
+                          meal_type: str = "other", date_str: str = None) -> str:
+    """Blocking body of log_food_intake, run in a worker thread."""
+    try:
+        if date_str is None:
+            date_str = _today()
+        
+        # Log the intake with calculated values
+        _insert_intake_rows([(date_str, food_name, portion_description, *_macro_values(macros),
+                              meal_type)])
+        
+        calories, protein, carbs, fat = _macro_values(macros)
+        return f"✅ Logged {portion_description} of {food_name} for {meal_type}\n" \
+               f"Added: {calories:.0f} cal, {protein:.1f}g protein, " \
+               f"{carbs:.1f}g carbs, {fat:.1f}g fat"
+    except Exception as e:
+        return f"❌ Error logging food: {str(e)}"
+
+@mcp.tool()
+async def log_food_intake(food_name: str, macros: Macros, portion_description: str,
+                          meal_type: str = "other", date_str: str = None) -> str:
     """Log food intake with calculated macros.
     
     Args:
         food_name: Name of the food eaten
-        calories: Total calories for this portion
-        protein: Total protein in grams for this portion
-        carbs: Total carbs in grams for this portion  
-        fat: Total fat in grams for this portion
+        macros: Total calories, plus protein, carbs and fat in grams, for this portion
         portion_description: Description of portion (e.g. "200g", "1 cup", "1 medium apple")
         meal_type: Type of meal (breakfast, lunch, dinner, snack, other)
         date_str: Date in YYYY-MM-DD format (optional, defaults to today)
     """
+    return await _run_db(_sync_log_food_intake, food_name, macros, portion_description,
+                         meal_type, date_str)
+
+def _sync_log_food_intake_bulk(entries: list[IntakeEntry]) -> str:
+    """Blocking body of log_food_intake_bulk, run in a worker thread."""
     try:
-        if date_str is None:
-            date_str = date.today().isoformat()
+        if not entries:
+            return "❌ No entries to log"
         
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+        today = _today()
+        rows = [
+            (entry.get('date_str') or today, entry['food_name'], entry['portion_description'],
+             *_macro_values(entry['macros']), entry.get('meal_type') or 'other')
+            for entry in entries
+        ]
+        # Total up before writing so a bad value fails without saving anything
+        calories = sum(row[3] for row in rows)
+        protein = sum(row[4] for row in rows)
+        carbs = sum(row[5] for row in rows)
+        fat = sum(row[6] for row in rows)
         
-        # Log the intake with calculated values
-        cursor.execute('''
-            INSERT INTO daily_intake 
-            (date, food_name, portion_description, calories, protein, carbs, fat, meal_type)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (date_str, food_name, portion_description, calories, protein, carbs, fat, meal_type))
+        _insert_intake_rows(rows)
         
-        conn.commit()
-        conn.close()
-        
-        return f"✅ Logged {portion_description} of {food_name} for {meal_type}\n" \
+        return f"✅ Logged {len(rows)} food entries\n" \
                f"Added: {calories:.0f} cal, {protein:.1f}g protein, " \
                f"{carbs:.1f}g carbs, {fat:.1f}g fat"
+    except KeyError as e:
+        return f"❌ Error logging food: entry is missing {e}"
     except Exception as e:
         return f"❌ Error logging food: {str(e)}"
 
 @mcp.tool()
-async def get_database_info() -> str:
-    """Get information about the database location and status."""
+async def log_food_intake_bulk(entries: list[IntakeEntry]) -> str:
+    """Log several food entries at once in a single transaction.
+    
+    Args:
+        entries: List of entries, each with food_name, macros and portion_description,
+                 plus optional meal_type and date_str (same meaning as in log_food_intake)
+    """
+    return await _run_db(_sync_log_food_intake_bulk, entries)
+
+def _sync_get_database_info() -> str:
+    """Blocking body of get_database_info, run in a worker thread."""
     try:
         file_exists = os.path.exists(DB_PATH)
         file_size = os.path.getsize(DB_PATH) if file_exists else 0
@@ -236,19 +520,9 @@ async def get_database_info() -> str:
             result += f"Size: {file_size} bytes\n"
             
             # Get some basic stats
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT COUNT(*) FROM foods")
-            food_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM daily_intake")
-            intake_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(DISTINCT date) FROM daily_goals")
-            goal_days = cursor.fetchone()[0]
-            
-            conn.close()
+            with _reader() as cursor:
+                cursor.execute(SQL_DATABASE_STATS)
+                food_count, intake_count, goal_days = cursor.fetchone()
             
             result += f"\n📊 Contents:\n"
             result += f"• {food_count} foods in database\n"
@@ -258,57 +532,100 @@ async def get_database_info() -> str:
         return result
     except Exception as e:
         return f"❌ Error getting database info: {str(e)}"
-    """Review daily macro values and progress.
+
+@mcp.tool()
+async def get_database_info() -> str:
+    """Get information about the database location and status."""
+    return await _run_db(_sync_get_database_info)
+
+def _daily_totals(cursor, date_str):
+    """Sum a day's intake in SQLite.
     
-    Args:
-        date_str: Date in YYYY-MM-DD format (optional, defaults to today)
+    Returns (entry_count, calories, protein, carbs, fat), with zeros for days without entries.
     """
-    return await get_daily_summary(date_str)
+    cursor.execute(SQL_DAY_TOTALS, (date_str,))
+    return cursor.fetchone()
+
+def _sync_review_day(date_str: str = None) -> str:
+    """Blocking body of review_day, run in a worker thread."""
+    try:
+        if date_str is None:
+            date_str = _today()
+        
+        with _reader() as cursor:
+            entry_count, *totals = _daily_totals(cursor, date_str)
+            
+            cursor.execute(SQL_SELECT_GOALS, (date_str,))
+            goals = cursor.fetchone()
+        
+        if not entry_count and goals is None:
+            return f"📊 No meals or goals recorded for {date_str}"
+        
+        parts = [f"📊 Macro Progress for {date_str}", "=" * 30,
+                 f"{entry_count} food entries logged", ""]
+        
+        if goals is None:
+            parts.append(_FMT_DAY_TOTALS(*totals))
+            parts.append("🎯 No goals set for this day. Use set_daily_goals to add some.")
+        else:
+            for (label, unit, spec), eaten, target in zip(_DAY_MACRO_LINES, totals, goals):
+                percent = f" ({eaten / target * 100:.0f}%)" if target else ""
+                if eaten > target:
+                    left = f"{eaten - target:{spec}}{unit} over"
+                else:
+                    left = f"{target - eaten:{spec}}{unit} remaining"
+                parts.append(f"• {label}: {eaten:{spec}}{unit} / {target:{spec}}{unit}{percent}, {left}")
+        
+        return "\n".join(parts) + "\n"
+    except Exception as e:
+        return f"❌ Error reviewing day: {str(e)}"
 
 @mcp.tool()
-async def review_meals(date_str: str = None) -> str:
-    """Review all meals for a specific day.
+async def review_day(date_str: str = None) -> str:
+    """Review daily macro totals and progress against the day's goals.
     
     Args:
         date_str: Date in YYYY-MM-DD format (optional, defaults to today)
     """
+    return await _run_db(_sync_review_day, date_str)
+
+def _sync_review_meals(date_str: str = None) -> str:
+    """Blocking body of review_meals, run in a worker thread."""
     try:
         if date_str is None:
-            date_str = date.today().isoformat()
+            date_str = _today()
         
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT meal_type, food_name, portion_description, calories, protein, carbs, fat, created_at
-            FROM daily_intake 
-            WHERE date = ?
-            ORDER BY meal_type, created_at
-        ''', (date_str,))
-        
-        meals = cursor.fetchall()
-        conn.close()
+        with _reader() as cursor:
+            cursor.execute(SQL_SELECT_MEALS, (date_str,))
+            meals = cursor.fetchall()
         
         if not meals:
             return f"🍽️ No meals logged for {date_str}"
         
-        result = f"🍽️ Meals for {date_str}\n"
-        result += "=" * 30 + "\n\n"
+        parts = [f"🍽️ Meals for {date_str}", "=" * 30, ""]
         
-        current_meal_type = None
-        for meal_type, food_name, portion_desc, calories, protein, carbs, fat, timestamp in meals:
-            if meal_type != current_meal_type:
-                current_meal_type = meal_type
-                result += f"🍽️ {meal_type.upper()}\n"
-                result += "-" * 15 + "\n"
+        for meal_type, entries in meals:
+            parts.append(f"🍽️ {meal_type.upper()}")
+            parts.append("-" * 15)
             
-            result += f"• {portion_desc} {food_name}\n"
-            result += f"  {calories:.0f} cal | {protein:.1f}g protein | {carbs:.1f}g carbs | {fat:.1f}g fat\n\n"
+            for food_name, portion_desc, *macros in json.loads(entries):
+                parts.append(_FMT_MEAL_ITEM(portion_desc, food_name))
+                parts.append(_FMT_MEAL_MACROS(*macros))
         
-        return result
+        return "\n".join(parts) + "\n"
     except Exception as e:
         return f"❌ Error reviewing meals: {str(e)}"
 
+@mcp.tool()
+async def review_meals(date_str: str = None) -> str:
+    """Review all meals for a specific day.
+    
+    Args:
+        date_str: Date in YYYY-MM-DD format (optional, defaults to today)
+    """
+    return await _run_db(_sync_review_meals, date_str)
+
 if __name__ == "__main__":
     # Initialize and run the server
+    init_database()
     mcp.run(transport='stdio')
\ No newline at end of file
@@ -0,0 +1,18 @@
+import queue
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Point the server at a fresh database file and close its connections afterwards."""
+    monkeypatch.setattr(main, "DB_PATH", str(tmp_path / "macro_tracker.db"))
+    monkeypatch.setattr(main, "_WRITER", None)
+    monkeypatch.setattr(main, "_READERS", queue.SimpleQueue())
+    yield tmp_path / "macro_tracker.db"
+    if main._WRITER is not None:
+        main._WRITER.close()
+    while not main._READERS.empty():
+        main._READERS.get().close()
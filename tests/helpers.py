@@ -0,0 +1,14 @@
+import asyncio
+
+import main
+
+
+def call_tool(tool, **arguments):
+    """Call a tool through FastMCP, so arguments are validated like a client's would be."""
+    content = asyncio.run(main.mcp.call_tool(tool, arguments))
+    return content[0].text
+
+
+def make_macros(calories, protein, carbs, fat):
+    """Build a Macros argument as a client would send it."""
+    return {"calories": calories, "protein": protein, "carbs": carbs, "fat": fat}
@@ -0,0 +1,222 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+import main
+from tests.helpers import call_tool, make_macros
+
+
+def test_failed_open_is_reported_and_retried(db):
+    db.write_bytes(b"this is not a sqlite database" * 100)
+
+    async def lookup_twice():
+        first = await asyncio.wait_for(main.lookup_food(), timeout=5)
+        second = await asyncio.wait_for(main.lookup_food(), timeout=5)
+        return first, second
+
+    first, second = asyncio.run(lookup_twice())
+
+    assert first.startswith("❌ Error opening database")
+    assert second.startswith("❌ Error opening database")
+    assert main._WRITER is None
+    assert main._READERS.empty()
+
+    db.unlink()
+    assert call_tool("lookup_food").startswith("📝 No foods in database yet")
+
+
+def test_macros_are_published_as_named_fields():
+    tools = {tool.name: tool for tool in asyncio.run(main.mcp.list_tools())}
+    schema = tools["log_food_intake"].inputSchema
+    macros = schema["$defs"]["Macros"]
+
+    assert macros["type"] == "object"
+    assert set(macros["required"]) == {"calories", "protein", "carbs", "fat"}
+    assert "Macros" in str(tools["log_food_intake_bulk"].inputSchema["$defs"]["IntakeEntry"])
+
+
+def test_bulk_log_coerces_numeric_strings(db):
+    entry = {"food_name": "Oats", "macros": make_macros("150", 5, 27, 3),
+             "portion_description": "40g", "meal_type": "breakfast"}
+    result = call_tool("log_food_intake_bulk", entries=[entry, entry])
+
+    assert result.startswith("✅ Logged 2 food entries")
+    assert "300 cal" in result
+
+
+def test_bulk_log_saves_nothing_when_an_entry_is_invalid(db):
+    good = {"food_name": "Oats", "macros": make_macros(150, 5, 27, 3), "portion_description": "40g"}
+    bad = dict(good, macros=make_macros("lots", 5, 27, 3))
+    result = main._call_db(main._sync_log_food_intake_bulk, [good, bad])
+
+    assert result.startswith("❌")
+    assert call_tool("review_meals").startswith("🍽️ No meals logged")
+
+
+def _add_foods(*names):
+    for name in names:
+        call_tool("add_food_to_database", name=name, macros=make_macros(50, 1, 10, 0.5))
+
+
+def test_lookup_matches_inside_words(db):
+    _add_foods("Apple", "Pineapple", "Strawberry", "Berry smoothie", "Oats")
+
+    apples = call_tool("lookup_food", name="app")
+    assert "Apple" in apples and "Pineapple" in apples
+    assert "Strawberry" not in apples
+
+    berries = call_tool("lookup_food", name="berry")
+    assert "Strawberry" in berries and "Berry smoothie" in berries
+    assert "Apple" not in berries
+
+
+def test_lookup_short_query_escapes_like_wildcards(db):
+    _add_foods("Oats", "100% juice")
+
+    assert "Oats" in call_tool("lookup_food", name="at")
+    found = call_tool("lookup_food", name="%")
+    assert "100% juice" in found and "Oats" not in found
+
+
+def test_review_day_without_goals_has_single_blank_line(db):
+    call_tool("log_food_intake", food_name="Oats", macros=make_macros(150, 5, 27, 3),
+              portion_description="40g", date_str="2024-01-01")
+
+    result = call_tool("review_day", date_str="2024-01-01")
+
+    assert "\n\n\n" not in result
+    assert "• Total: 150 cal | 5.0g protein | 27.0g carbs | 3.0g fat\n🎯" in result
+
+
+def test_review_day_reports_overshoot(db):
+    call_tool("set_daily_goals", targets=make_macros(2000, 100, 250, 60), date_str="2024-01-01")
+    call_tool("log_food_intake", food_name="Steak", macros=make_macros(800, 120, 0, 50),
+              portion_description="400g", date_str="2024-01-01")
+
+    result = call_tool("review_day", date_str="2024-01-01")
+
+    assert "• Protein: 120.0g / 100.0g (120%), 20.0g over" in result
+    assert "• Calories: 800 cal / 2000 cal (40%), 1200 cal remaining" in result
+    assert "-" not in result.split("=" * 30)[1]
+
+
+def test_review_meals_keeps_entries_intact_and_in_order(db):
+    names = ["Toast", "Eggs | bacon", "Odd\x1ename\x1f", "Coffee, black"]
+    for index, food_name in enumerate(names):
+        call_tool("log_food_intake", food_name=food_name, macros=make_macros(100 + index, 1, 2, 3),
+                  portion_description="1 serving", meal_type="breakfast", date_str="2024-01-01")
+
+    result = call_tool("review_meals", date_str="2024-01-01")
+
+    positions = [result.index(f"• 1 serving {food_name}\n") for food_name in names]
+    assert positions == sorted(positions)
+    assert "  103 cal | 1.0g protein | 2.0g carbs | 3.0g fat" in result
+
+
+def test_failed_commit_leaves_writer_usable(db):
+    call_tool("lookup_food")
+    writer = main._WRITER
+    # A deferred foreign key violation makes COMMIT itself fail
+    writer.execute("PRAGMA foreign_keys = ON")
+    writer.execute("CREATE TEMP TABLE parent (id INTEGER PRIMARY KEY)")
+    writer.execute("CREATE TEMP TABLE child (parent_id REFERENCES parent(id) "
+                   "DEFERRABLE INITIALLY DEFERRED)")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with main._write_transaction() as cursor:
+            cursor.execute("INSERT INTO child VALUES (1)")
+
+    assert not writer.in_transaction
+    result = call_tool("log_food_intake", food_name="Oats", macros=make_macros(150, 5, 27, 3),
+                       portion_description="40g")
+    assert result.startswith("✅ Logged 40g of Oats")
+
+
+def test_readers_share_the_pool_and_cannot_write(db):
+    call_tool("add_food_to_database", name="Oats", macros=make_macros(380, 13, 67, 7))
+
+    async def lookups():
+        return await asyncio.gather(*(main.lookup_food("Oats") for _ in range(20)))
+
+    assert all("• Oats:" in result for result in asyncio.run(lookups()))
+    assert main._READERS.qsize() == main._READER_COUNT
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        with main._reader() as cursor:
+            cursor.execute("DELETE FROM foods")
+
+
+def test_database_path_with_uri_characters(tmp_path, db, monkeypatch):
+    path = tmp_path / "a#b?c %41" / "macro_tracker.db"
+    path.parent.mkdir()
+    monkeypatch.setattr(main, "DB_PATH", str(path))
+
+    call_tool("log_food_intake", food_name="Oats", macros=make_macros(150, 5, 27, 3),
+              portion_description="40g", meal_type="breakfast", date_str="2024-01-01")
+
+    assert "• 40g Oats" in call_tool("review_meals", date_str="2024-01-01")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a#b?c %41"]
+
+
+def test_adding_a_duplicate_food_keeps_the_original(db):
+    first = call_tool("add_food_to_database", name="Oats", macros=make_macros(380, 13, 67, 7))
+    second = call_tool("add_food_to_database", name="Oats", macros=make_macros(1, 1, 1, 1))
+
+    assert first.startswith("✅ Added Oats")
+    assert second == "❌ Food 'Oats' already exists in database"
+    assert "• Oats: 380.0cal, 13.0g protein" in call_tool("lookup_food", name="Oats")
+    assert not main._WRITER.in_transaction
+
+
+def _close_connections():
+    main._WRITER.close()
+    main._WRITER = None
+    while not main._READERS.empty():
+        main._READERS.get().close()
+
+
+def test_baseline_database_is_migrated_once(db, monkeypatch):
+    # Tables as the original server created them, with no indexes, FTS or user_version
+    conn = sqlite3.connect(db)
+    conn.executescript("""
+        CREATE TABLE foods (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE NOT NULL,
+            calories REAL NOT NULL, protein REAL NOT NULL, carbs REAL NOT NULL,
+            fat REAL NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE daily_goals (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT UNIQUE NOT NULL,
+            target_calories REAL NOT NULL, target_protein REAL NOT NULL,
+            target_carbs REAL NOT NULL, target_fat REAL NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE daily_intake (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL,
+            food_name TEXT NOT NULL, portion_description TEXT NOT NULL,
+            calories REAL NOT NULL, protein REAL NOT NULL, carbs REAL NOT NULL,
+            fat REAL NOT NULL, meal_type TEXT DEFAULT 'other',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        INSERT INTO foods (name, calories, protein, carbs, fat) VALUES ('Pineapple', 50, 0.5, 13, 0.1);
+    """)
+    conn.close()
+
+    # Existing foods are indexed, so a mid-word search goes through foods_fts
+    assert "• Pineapple:" in call_tool("lookup_food", name="apple")
+    assert main._WRITER.execute("PRAGMA user_version").fetchone()[0] == main.SCHEMA_VERSION
+
+    def fail(cursor):
+        raise AssertionError("DDL ran on a current schema")
+
+    _close_connections()
+    monkeypatch.setattr(main, "_create_tables", fail)
+    assert "• Pineapple:" in call_tool("lookup_food", name="apple")
+
+
+def test_review_meals_lists_meals_in_logging_order(db):
+    entries = [{"food_name": food_name, "macros": make_macros(100, 1, 2, 3),
+                "portion_description": "1 serving", "meal_type": meal_type,
+                "date_str": "2024-01-01"}
+               for food_name, meal_type in [("Soup", "lunch"), ("Toast", "breakfast"),
+                                            ("Pasta", "dinner"), ("Bread", "lunch")]]
+    call_tool("log_food_intake_bulk", entries=entries)
+
+    result = call_tool("review_meals", date_str="2024-01-01")
+
+    headers = [line for line in result.splitlines() if line.startswith("🍽️ ") and "Meals" not in line]
+    assert headers == ["🍽️ LUNCH", "🍽️ BREAKFAST", "🍽️ DINNER"]
+    assert result.index("Soup") < result.index("Bread") < result.index("Toast")